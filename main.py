@@ -11,13 +11,20 @@ Communicates with dimmers via a local python-matter-server instance over WebSock
 
 import argparse
 import asyncio
+import contextlib
 import datetime
+import functools
 import json
+import logging
 import math
 import os
+import re
 import signal
+import socket
+import struct
 import subprocess
 import sys
+import tempfile
 import time
 from pathlib import Path
 
@@ -39,10 +46,28 @@ DEFAULT_DIM_TIME = None  # disabled by default
 DEFAULT_RAMP_DURATION = 30  # minutes
 DEFAULT_DIM_DURATION = 135  # minutes
 MATTER_CONNECT_TIMEOUT = 30  # seconds
+WAKE_SOCKET = "\0circadian-ramp"  # Linux abstract-namespace Unix socket
+# 24-hour H:MM / HH:MM with the range check built in (leading zeros optional)
+_HHMM_RE = re.compile(r"([01]?\d|2[0-3]):([0-5]?\d)")
+
+
+def _parse_hhmm(value: str) -> tuple[int, int]:
+    """Split an 'HH:MM' string into (hour, minute) ints.
+
+    Raises ValueError if *value* isn't a valid 24-hour time.
+    """
+    match = _HHMM_RE.fullmatch(value)
+    if not match:
+        raise ValueError(f"Invalid time format: {value!r}. Use HH:MM.")
+    return int(match[1]), int(match[2])
+
 
 # These are initialized after load_dotenv() by _init_env_config().
 DEFAULT_RAMP_TIME = DEFAULT_RAMP_TIME_FALLBACK
 OVERRIDE_FILE = SCRIPT_DIR / "overrides.json"
+# (hour, minute) forms of the default times, set by _init_service_times()
+_DEFAULT_RAMP_HM = _parse_hhmm(DEFAULT_RAMP_TIME_FALLBACK)
+_DEFAULT_DIM_HM = None
 
 
 def _init_env_config() -> None:
@@ -56,38 +81,136 @@ def _init_env_config() -> None:
     DEFAULT_DIM_DURATION = int(os.environ.get("DIM_DURATION", "135"))
     OVERRIDE_FILE = Path(os.environ.get("OVERRIDE_FILE", SCRIPT_DIR / "overrides.json"))
 
+
+def _init_service_times() -> None:
+    """Parse RAMP_TIME/DIM_TIME once for the service loop; exit if invalid.
+
+    Only the service needs the parsed forms, so other subcommands keep
+    working with a bad value (e.g. to reschedule around it).
+    """
+    global _DEFAULT_RAMP_HM, _DEFAULT_DIM_HM
+    try:
+        _DEFAULT_RAMP_HM = _parse_hhmm(DEFAULT_RAMP_TIME)
+        _DEFAULT_DIM_HM = _parse_hhmm(DEFAULT_DIM_TIME) if DEFAULT_DIM_TIME else None
+    except ValueError as e:
+        print(f"Error: RAMP_TIME/DIM_TIME: {e}", file=sys.stderr)
+        sys.exit(1)
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
 
 
-def log(message: str) -> None:
-    """Print timestamped log message to stdout."""
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] {message}", flush=True)
+logger = logging.getLogger("circadian-ramp")
+
+
+def _init_logging() -> None:
+    """Send timestamped log records to stdout. Call after load_dotenv().
+
+    stdout is line buffered so each record reaches journald as it's logged.
+    Per-step ramp/dim lines are only emitted with LOG_LEVEL=DEBUG.
+    """
+    sys.stdout.reconfigure(line_buffering=True)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(
+        logging.Formatter("[%(asctime)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    )
+    logger.addHandler(handler)
+    logger.propagate = False
+    level = os.environ.get("LOG_LEVEL", "INFO").upper()
+    try:
+        logger.setLevel(level)
+    except ValueError:
+        logger.setLevel(logging.INFO)
+        logger.warning(f"Unknown LOG_LEVEL {level!r}, using INFO")
 
 
 # ---------------------------------------------------------------------------
-# Override helpers
+# JSON file helpers
 # ---------------------------------------------------------------------------
 
 
-def load_overrides() -> dict:
-    """Load the overrides JSON file. Returns {} if missing or invalid."""
+def _load_json(path: Path) -> dict:
+    """Load a JSON file. Returns {} if missing or invalid."""
     try:
-        return json.loads(OVERRIDE_FILE.read_text())
+        return json.loads(path.read_text())
     except (FileNotFoundError, json.JSONDecodeError):
         return {}
 
 
+def _write_json(path: Path, data: dict, indent: int | None = 2) -> None:
+    """Atomically replace *path* with *data* as JSON, skipping unchanged writes.
+
+    The new contents go to a temp file in the same directory, are fsync'd,
+    then renamed over *path*, so a crash never leaves a truncated file.
+    Falls back to an in-place write if the directory isn't writable.
+    """
+    separators = None if indent is not None else (",", ":")
+    text = json.dumps(data, indent=indent, separators=separators) + "\n"
+
+    # Compare raw text, not parsed data: a corrupt file loads as {} and must
+    # still be rewritten
+    try:
+        if path.read_text() == text:
+            return
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+
+    try:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    except PermissionError:
+        path.write_text(text)
+        return
+
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 owned by us; keep the existing file's mode and
+        # owner/group so users who could write it before still can
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            os.chmod(tmp, 0o644)
+        else:
+            try:
+                os.chown(tmp, st.st_uid, st.st_gid)
+            except PermissionError:
+                # Not root: we can't give the file away, but can keep its group
+                try:
+                    os.chown(tmp, -1, st.st_gid)
+                except PermissionError:
+                    pass
+            os.chmod(tmp, st.st_mode & 0o777)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+# ---------------------------------------------------------------------------
+# Override helpers
+# ---------------------------------------------------------------------------
+
+
+def load_overrides() -> dict:
+    """Load the overrides JSON file. Returns {} if missing or invalid."""
+    return _load_json(OVERRIDE_FILE)
+
+
 def save_overrides(overrides: dict) -> None:
     """Write overrides dict to the JSON file."""
-    OVERRIDE_FILE.write_text(json.dumps(overrides, indent=2) + "\n")
+    _write_json(OVERRIDE_FILE, overrides)
 
 
-def cleanup_overrides(overrides: dict) -> dict:
-    """Remove entries for dates in the past. Returns cleaned dict."""
-    today = datetime.date.today().isoformat()
+def cleanup_overrides(overrides: dict, today: str | None = None) -> dict:
+    """Remove entries for dates before *today* (default: now). Returns cleaned dict."""
+    if today is None:
+        today = datetime.date.today().isoformat()
     cleaned = {date: val for date, val in overrides.items() if date >= today}
     return cleaned
 
@@ -131,6 +254,15 @@ def set_event_override(overrides: dict, date_str: str, event: str, value: dict)
     overrides[date_str] = entry
 
 
+_RELATIVE_DAYS = {"today": 0, "tomorrow": 1}
+_DAY_NAMES = {
+    name: i for i, name in enumerate((
+        "monday", "tuesday", "wednesday", "thursday",
+        "friday", "saturday", "sunday",
+    ))
+}
+
+
 def parse_date_arg(value: str) -> str:
     """Parse a human-friendly date string into YYYY-MM-DD.
 
@@ -139,18 +271,13 @@ def parse_date_arg(value: str) -> str:
     low = value.lower()
     today = datetime.date.today()
 
-    if low == "today":
-        return today.isoformat()
-    if low == "tomorrow":
-        return (today + datetime.timedelta(days=1)).isoformat()
+    days_ahead = _RELATIVE_DAYS.get(low)
+    if days_ahead is not None:
+        return (today + datetime.timedelta(days=days_ahead)).isoformat()
 
     # Day name (monday..sunday) → next occurrence
-    day_names = [
-        "monday", "tuesday", "wednesday", "thursday",
-        "friday", "saturday", "sunday",
-    ]
-    if low in day_names:
-        target_weekday = day_names.index(low)
+    target_weekday = _DAY_NAMES.get(low)
+    if target_weekday is not None:
         days_ahead = (target_weekday - today.weekday()) % 7
         if days_ahead == 0:
             days_ahead = 7  # next week if today is that day
@@ -175,40 +302,31 @@ def parse_date_arg(value: str) -> str:
 
 def load_state() -> dict:
     """Load the state JSON file. Returns {} if missing or invalid."""
-    try:
-        return json.loads(STATE_FILE.read_text())
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+    return _load_json(STATE_FILE)
 
 
 def save_state(state: dict) -> None:
-    """Write state dict to the JSON file."""
-    STATE_FILE.write_text(json.dumps(state, indent=2) + "\n")
+    """Write state dict to the JSON file (compact: it is only machine-read)."""
+    _write_json(STATE_FILE, state, indent=None)
 
 
-def already_ran_today() -> bool:
-    """Check if the ramp already ran today."""
-    state = load_state()
-    return state.get("last_run") == datetime.date.today().isoformat()
+def _event_done(state: dict, event: str, date_str: str) -> bool:
+    """Check in an already-loaded *state* whether *event* ran on *date_str*."""
+    key = "last_run" if event == "ramp" else "last_dim"
+    return state.get(key) == date_str
 
 
-def record_run() -> None:
-    """Record that the ramp ran today."""
+def record_run(date_str: str) -> None:
+    """Record that the ramp ran for *date_str*."""
     state = load_state()
-    state["last_run"] = datetime.date.today().isoformat()
+    state["last_run"] = date_str
     save_state(state)
 
 
-def already_dimmed_today() -> bool:
-    """Check if the dim already ran today."""
+def record_dim(date_str: str) -> None:
+    """Record that the dim ran for *date_str*."""
     state = load_state()
-    return state.get("last_dim") == datetime.date.today().isoformat()
-
-
-def record_dim() -> None:
-    """Record that the dim ran today."""
-    state = load_state()
-    state["last_dim"] = datetime.date.today().isoformat()
+    state["last_dim"] = date_str
     save_state(state)
 
 
@@ -216,7 +334,27 @@ def record_dim() -> None:
 # Interruptible sleep via SIGUSR1 (async)
 # ---------------------------------------------------------------------------
 
-_wake_event = asyncio.Event()
+# A pending sleep is a future resolved either by a timer armed at an absolute
+# monotonic deadline or by the SIGUSR1 callback registered in cmd_service.
+_wake_future: "asyncio.Future[bool] | None" = None
+
+
+def _resolve(future: asyncio.Future, value: bool) -> None:
+    """Set *future*'s result unless it has already been resolved."""
+    if not future.done():
+        future.set_result(value)
+
+
+def _wake() -> None:
+    """Interrupt the pending interruptible_sleep, if any."""
+    if _wake_future is not None:
+        _resolve(_wake_future, True)
+
+
+def _on_sigusr1() -> None:
+    """SIGUSR1 callback registered with loop.add_signal_handler."""
+    logger.info("Received SIGUSR1, waking up to re-evaluate schedule")
+    _wake()
 
 
 async def interruptible_sleep(seconds: float) -> bool:
@@ -224,21 +362,87 @@ async def interruptible_sleep(seconds: float) -> bool:
 
     Returns True if interrupted, False if the full duration elapsed.
     """
-    _wake_event.clear()
+    global _wake_future
+    loop = asyncio.get_running_loop()
+    future = _wake_future = loop.create_future()
+    timer = loop.call_at(loop.time() + seconds, _resolve, future, False)
     try:
-        await asyncio.wait_for(_wake_event.wait(), timeout=seconds)
-        return True  # interrupted
-    except asyncio.TimeoutError:
-        return False  # full duration elapsed
+        return await future
+    finally:
+        timer.cancel()
+        if _wake_future is future:
+            _wake_future = None
 
 
 # ---------------------------------------------------------------------------
-# Service notification via systemctl reload
+# Service notification via wake socket (or systemctl reload)
 # ---------------------------------------------------------------------------
 
 
+async def _handle_wake_connection(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+) -> None:
+    """Wake the service if the client sends any data; a bare connect is a ping."""
+    try:
+        if await reader.read(1):
+            logger.info("Wake request received, re-evaluating schedule")
+            _wake()
+    finally:
+        writer.close()
+
+
+async def _start_wake_server() -> "asyncio.Server | None":
+    """Listen on WAKE_SOCKET. Returns None if it can't be bound.
+
+    Binding fails if another service instance already holds the name, or on
+    platforms without abstract sockets; SIGUSR1 still works in either case.
+    """
+    try:
+        return await asyncio.start_unix_server(_handle_wake_connection, path=WAKE_SOCKET)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Wake socket unavailable ({e}), relying on SIGUSR1 only")
+        return None
+
+
+def _connect_wake_socket() -> socket.socket:
+    """Connect to the running service's wake socket. Raises OSError if absent."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(1)
+        sock.connect(WAKE_SOCKET)
+    except (OSError, ValueError) as e:
+        sock.close()
+        raise OSError(e) from e
+    return sock
+
+
+def _check_wake_peer(sock: socket.socket) -> None:
+    """Raise OSError unless *sock*'s listener runs as root or as us.
+
+    Abstract socket names have no permissions, so while the service is down
+    any local user could bind WAKE_SOCKET and swallow our wake requests.
+    """
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _pid, uid, _gid = struct.unpack("3i", creds)
+    if uid not in (0, os.geteuid()):
+        raise OSError(f"wake socket is held by uid {uid}, not the service")
+
+
 def notify_service() -> None:
-    """Ask systemd to reload the service, which sends SIGUSR1 via ExecReload."""
+    """Wake the running service so it re-evaluates the schedule.
+
+    Sends a byte to the service's wake socket.  If that isn't reachable, or
+    is held by a process that isn't the service, asks systemd to reload the
+    service, which sends SIGUSR1 via ExecReload.
+    """
+    try:
+        with _connect_wake_socket() as sock:
+            _check_wake_peer(sock)
+            sock.sendall(b"\n")
+        return
+    except OSError:
+        pass
+
     try:
         subprocess.run(
             ["systemctl", "reload", SERVICE_NAME],
@@ -268,14 +472,19 @@ def matter_level_to_pct(level: int) -> int:
 # ---------------------------------------------------------------------------
 
 
-async def matter_connect(url: str) -> tuple[MatterClient, aiohttp.ClientSession, asyncio.Task]:
+async def matter_connect(
+    url: str, ws_session: "aiohttp.ClientSession | None" = None,
+) -> tuple[MatterClient, aiohttp.ClientSession, asyncio.Task]:
     """Create, connect, and start listening on a MatterClient.
 
     Returns (client, aiohttp_session, listen_task).
     ``start_listening`` runs as a background task; the function waits for the
-    initial node data before returning.
+    initial node data before returning.  Pass an open *ws_session* to reuse it
+    (e.g. when reconnecting); otherwise a new one is created.
     """
-    ws_session = aiohttp.ClientSession()
+    owns_session = ws_session is None or ws_session.closed
+    if owns_session:
+        ws_session = aiohttp.ClientSession()
     client = MatterClient(url, ws_session)
 
     init_ready = asyncio.Event()
@@ -289,7 +498,8 @@ async def matter_connect(url: str) -> tuple[MatterClient, aiohttp.ClientSession,
         await asyncio.wait_for(init_ready.wait(), timeout=MATTER_CONNECT_TIMEOUT)
     except asyncio.TimeoutError:
         listen_task.cancel()
-        await ws_session.close()
+        if owns_session:
+            await ws_session.close()
         raise ConnectionError(
             f"Timed out after {MATTER_CONNECT_TIMEOUT}s waiting for matter-server at {url}"
         )
@@ -301,8 +511,12 @@ async def matter_disconnect(
     client: MatterClient,
     ws_session: aiohttp.ClientSession,
     listen_task: asyncio.Task,
+    close_session: bool = True,
 ) -> None:
-    """Cleanly disconnect from matter-server."""
+    """Cleanly disconnect from matter-server.
+
+    With *close_session* False the aiohttp session is left open for reuse.
+    """
     try:
         await client.disconnect()
     except Exception:
@@ -312,7 +526,21 @@ async def matter_disconnect(
         await listen_task
     except (asyncio.CancelledError, Exception):
         pass
-    await ws_session.close()
+    if close_session:
+        await ws_session.close()
+
+
+@contextlib.asynccontextmanager
+async def matter_session(url: str):
+    """Connect to matter-server for the duration of an ``async with`` block.
+
+    Yields the client and disconnects on exit, whether or not the block raised.
+    """
+    client, ws_session, listen_task = await matter_connect(url)
+    try:
+        yield client
+    finally:
+        await matter_disconnect(client, ws_session, listen_task)
 
 
 # ---------------------------------------------------------------------------
@@ -320,25 +548,23 @@ async def matter_disconnect(
 # ---------------------------------------------------------------------------
 
 
-def calculate_brightness_times(total_seconds: float) -> list[tuple[float, int]]:
-    """Calculate the exact time each brightness level should be reached."""
-    times = []
-    min_brightness = 1
-    max_brightness = 100
+# Fraction of the ramp elapsed when each brightness level 1..100 is reached.
+_LOG_FRACTION = tuple(math.log(b) / math.log(100) for b in range(1, 101))
 
-    log_ratio = math.log(max_brightness / min_brightness)
 
-    for brightness in range(min_brightness, max_brightness + 1):
-        if brightness == min_brightness:
-            t = 0
-        else:
-            t = total_seconds * math.log(brightness / min_brightness) / log_ratio
-        times.append((t, brightness))
+@functools.lru_cache(maxsize=4)
+def calculate_brightness_times(total_seconds: float) -> tuple[int, ...]:
+    """Return the offset (integer ms) at which each brightness level is reached.
 
-    return times
+    Index ``i`` holds the offset for brightness ``i + 1``, so the tuple always
+    has 100 entries starting at 0.
+    """
+    total_ms = total_seconds * 1000
+    return tuple(int(total_ms * fraction) for fraction in _LOG_FRACTION)
 
 
 MAX_CONSECUTIVE_FAILURES = 5
+COMMAND_TIMEOUT = 10  # seconds allowed per node for a single command
 
 
 async def _send_command(client: MatterClient, node_id: int, command) -> None:
@@ -346,6 +572,73 @@ async def _send_command(client: MatterClient, node_id: int, command) -> None:
     await client.send_device_command(node_id, endpoint_id=1, command=command)
 
 
+def _level_command(pct: int):
+    """Build a MoveToLevelWithOnOff command for *pct* brightness, no transition."""
+    return clusters.LevelControl.Commands.MoveToLevelWithOnOff(
+        level=pct_to_matter_level(pct),
+        transitionTime=0, optionsMask=0, optionsOverride=0,
+    )
+
+
+async def _send_to_nodes(
+    client: MatterClient, node_ids: list[int], command, action: str,
+) -> bool:
+    """Send *command* to all *node_ids* concurrently.
+
+    Each node gets COMMAND_TIMEOUT seconds, so one slow dimmer can't delay the
+    others.  Failures are logged per node as "Error <action> node <id>".
+    Returns True if any node failed.
+    """
+    results = await asyncio.gather(
+        *(
+            asyncio.wait_for(_send_command(client, node_id, command), COMMAND_TIMEOUT)
+            for node_id in node_ids
+        ),
+        return_exceptions=True,
+    )
+    failed = False
+    for node_id, result in zip(node_ids, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Error {action} node {node_id}: {result or type(result).__name__}")
+            failed = True
+    return failed
+
+
+async def _reconnect_or_abort(
+    client: MatterClient,
+    label: str,
+    matter_url: "str | None",
+    ws_session_ref: "list | None",
+    listen_task_ref: "list | None",
+) -> MatterClient:
+    """Handle MAX_CONSECUTIVE_FAILURES during a ramp or dim (*label*).
+
+    Reconnects if *matter_url* and both refs were given, storing the new
+    session/task in the refs and returning the new client.  Otherwise, or if
+    reconnecting fails, raises so the event aborts.
+    """
+    if not (matter_url and ws_session_ref is not None and listen_task_ref is not None):
+        logger.error(f"Aborting {label} after {MAX_CONSECUTIVE_FAILURES} consecutive failures")
+        raise ConnectionError("Too many consecutive command failures")
+
+    logger.warning("Too many failures, attempting reconnection...")
+    try:
+        await matter_disconnect(
+            client, ws_session_ref[0], listen_task_ref[0], close_session=False,
+        )
+    except Exception:
+        pass
+    try:
+        client, ws_session_ref[0], listen_task_ref[0] = await matter_connect(
+            matter_url, ws_session_ref[0],
+        )
+    except Exception as e:
+        logger.error(f"Reconnection failed: {e}, aborting {label}")
+        raise
+    logger.info(f"Reconnected successfully, resuming {label}")
+    return client
+
+
 async def run_ramp(
     client: MatterClient,
     node_ids: list[int],
@@ -364,89 +657,45 @@ async def run_ramp(
     Returns the (possibly new) client.
     """
     if not node_ids:
-        log("No nodes to control!")
+        logger.warning("No nodes to control!")
         return client
 
-    log(f"Starting brightness ramp on node(s): {', '.join(str(n) for n in node_ids)}")
-    log(f"Duration: {total_seconds / 60:.1f} minutes")
+    logger.info(f"Starting brightness ramp on node(s): {', '.join(str(n) for n in node_ids)}")
+    logger.info(f"Duration: {total_seconds / 60:.1f} minutes")
 
-    # Turn on and set initial brightness
-    for node_id in node_ids:
-        try:
-            await _send_command(client, node_id, clusters.OnOff.Commands.On())
-        except Exception as e:
-            log(f"Error turning on node {node_id}: {e}")
+    # Turn on; the first schedule entry (offset 0) sets the initial 1%
+    await _send_to_nodes(client, node_ids, clusters.OnOff.Commands.On(), "turning on")
 
     brightness_schedule = calculate_brightness_times(total_seconds)
 
-    log("Initial brightness: 1%")
-    for node_id in node_ids:
-        try:
-            await _send_command(
-                client, node_id,
-                clusters.LevelControl.Commands.MoveToLevelWithOnOff(
-                    level=pct_to_matter_level(1),
-                    transitionTime=0, optionsMask=0, optionsOverride=0,
-                ),
-            )
-        except Exception as e:
-            log(f"Error setting brightness on node {node_id}: {e}")
-
-    start_time = time.time()
+    # Absolute monotonic deadlines so clock steps (NTP, DST) can't skew the ramp
+    start_ns = time.monotonic_ns()
+    deadlines_ns = [start_ns + offset_ms * 1_000_000 for offset_ms in brightness_schedule]
     consecutive_failures = 0
 
-    for target_time, brightness in brightness_schedule[1:]:
-        now = time.time()
-        elapsed = now - start_time
-        sleep_duration = target_time - elapsed
-
-        if sleep_duration > 0:
-            await asyncio.sleep(sleep_duration)
+    for brightness, deadline_ns in enumerate(deadlines_ns, start=1):
+        sleep_ns = deadline_ns - time.monotonic_ns()
+        if sleep_ns > 0:
+            await asyncio.sleep(sleep_ns / 1e9)
 
-        elapsed = time.time() - start_time
-        log(f"Setting brightness to {brightness}% ({elapsed / 60:.1f} min elapsed)")
+        elapsed = (time.monotonic_ns() - start_ns) / 1e9
+        logger.debug("Setting brightness to %d%% (%.1f min elapsed)", brightness, elapsed / 60)
 
-        step_failed = False
-        for node_id in node_ids:
-            try:
-                await _send_command(
-                    client, node_id,
-                    clusters.LevelControl.Commands.MoveToLevelWithOnOff(
-                        level=pct_to_matter_level(brightness),
-                        transitionTime=0, optionsMask=0, optionsOverride=0,
-                    ),
-                )
-            except Exception as e:
-                log(f"Error updating node {node_id}: {e}")
-                step_failed = True
+        failed = await _send_to_nodes(
+            client, node_ids, _level_command(brightness), "updating",
+        )
 
-        if step_failed:
+        if failed:
             consecutive_failures += 1
             if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
-                # Try reconnecting once if we have a URL
-                if matter_url and ws_session_ref is not None and listen_task_ref is not None:
-                    log("Too many failures, attempting reconnection...")
-                    try:
-                        await matter_disconnect(client, ws_session_ref[0], listen_task_ref[0])
-                    except Exception:
-                        pass
-                    try:
-                        client, new_ws, new_task = await matter_connect(matter_url)
-                        ws_session_ref[0] = new_ws
-                        listen_task_ref[0] = new_task
-                        consecutive_failures = 0
-                        log("Reconnected successfully, resuming ramp")
-                        continue
-                    except Exception as re:
-                        log(f"Reconnection failed: {re}, aborting ramp")
-                        raise
-                else:
-                    log(f"Aborting ramp after {MAX_CONSECUTIVE_FAILURES} consecutive failures")
-                    raise ConnectionError("Too many consecutive command failures")
+                client = await _reconnect_or_abort(
+                    client, "ramp", matter_url, ws_session_ref, listen_task_ref,
+                )
+                consecutive_failures = 0
         else:
             consecutive_failures = 0
 
-    log("Brightness ramp complete!")
+    logger.info("Brightness ramp complete!")
     return client
 
 
@@ -484,18 +733,15 @@ def calculate_dim_times(total_seconds: float, start_pct: int = 100) -> list[tupl
 async def _read_current_brightness(client: MatterClient, node_id: int) -> int | None:
     """Read current brightness percentage from a node, or None on failure."""
     try:
-        nodes = client.get_nodes()
-        for node in nodes:
-            if node.node_id == node_id:
-                level = node.get_attribute_value(
-                    clusters.LevelControl.Attributes.CurrentLevel
-                )
-                if level is not None:
-                    return matter_level_to_pct(level)
-                return None
+        # Direct lookup by id; the dim calls this for every node on every step
+        level = client.get_node(node_id).get_attribute_value(
+            clusters.LevelControl.Attributes.CurrentLevel
+        )
     except Exception:
-        pass
-    return None
+        return None
+    if level is None:
+        return None
+    return matter_level_to_pct(level)
 
 
 async def run_dim(
@@ -515,94 +761,67 @@ async def run_dim(
     Returns the (possibly new) client.
     """
     if not node_ids:
-        log("No nodes to control!")
+        logger.warning("No nodes to control!")
         return client
 
     # Read current brightness from first node to determine starting point
     current_pct = await _read_current_brightness(client, node_ids[0])
     if current_pct is None:
         current_pct = 100
-        log("Could not read current brightness, assuming 100%")
+        logger.warning("Could not read current brightness, assuming 100%")
     else:
-        log(f"Current brightness: {current_pct}%")
+        logger.info(f"Current brightness: {current_pct}%")
 
     if current_pct < 2:
-        log("Lights already off or very dim, skipping dim")
+        logger.info("Lights already off or very dim, skipping dim")
         return client
 
-    log(f"Starting brightness dim on node(s): {', '.join(str(n) for n in node_ids)}")
-    log(f"Duration: {total_seconds / 60:.1f} minutes, from {current_pct}% to off")
+    logger.info(f"Starting brightness dim on node(s): {', '.join(str(n) for n in node_ids)}")
+    logger.info(f"Duration: {total_seconds / 60:.1f} minutes, from {current_pct}% to off")
 
     dim_schedule = calculate_dim_times(total_seconds, start_pct=current_pct)
 
-    start_time = time.time()
+    start_ns = time.monotonic_ns()
+    deadlines_ns = [start_ns + int(t * 1e9) for t, _ in dim_schedule]
     consecutive_failures = 0
 
-    for target_time, brightness in dim_schedule:
-        now = time.time()
-        elapsed = now - start_time
-        sleep_duration = target_time - elapsed
+    for deadline_ns, (_, brightness) in zip(deadlines_ns, dim_schedule):
+        sleep_ns = deadline_ns - time.monotonic_ns()
+        if sleep_ns > 0:
+            await asyncio.sleep(sleep_ns / 1e9)
 
-        if sleep_duration > 0:
-            await asyncio.sleep(sleep_duration)
-
-        elapsed = time.time() - start_time
-        log(f"Setting brightness to {brightness}% ({elapsed / 60:.1f} min elapsed)")
+        elapsed = (time.monotonic_ns() - start_ns) / 1e9
+        logger.debug("Setting brightness to %d%% (%.1f min elapsed)", brightness, elapsed / 60)
 
         # Per-node: never brighten during a dim
-        step_failed = False
+        step_nodes = []
         for node_id in node_ids:
             actual_pct = await _read_current_brightness(client, node_id)
             if actual_pct is not None and actual_pct < brightness:
-                log(f"Node {node_id} already at {actual_pct}% (target {brightness}%), skipping")
+                logger.info(f"Node {node_id} already at {actual_pct}% (target {brightness}%), skipping")
                 continue
             if actual_pct is None:
-                log(f"Could not read brightness for node {node_id}, skipping step (won't risk brightening)")
+                logger.warning(f"Could not read brightness for node {node_id}, skipping step (won't risk brightening)")
                 continue
-            try:
-                await _send_command(
-                    client, node_id,
-                    clusters.LevelControl.Commands.MoveToLevelWithOnOff(
-                        level=pct_to_matter_level(brightness),
-                        transitionTime=0, optionsMask=0, optionsOverride=0,
-                    ),
-                )
-            except Exception as e:
-                log(f"Error updating node {node_id}: {e}")
-                step_failed = True
+            step_nodes.append(node_id)
+
+        step_failed = await _send_to_nodes(
+            client, step_nodes, _level_command(brightness), "updating",
+        )
 
         if step_failed:
             consecutive_failures += 1
             if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
-                if matter_url and ws_session_ref is not None and listen_task_ref is not None:
-                    log("Too many failures, attempting reconnection...")
-                    try:
-                        await matter_disconnect(client, ws_session_ref[0], listen_task_ref[0])
-                    except Exception:
-                        pass
-                    try:
-                        client, new_ws, new_task = await matter_connect(matter_url)
-                        ws_session_ref[0] = new_ws
-                        listen_task_ref[0] = new_task
-                        consecutive_failures = 0
-                        log("Reconnected successfully, resuming dim")
-                        continue
-                    except Exception as re:
-                        log(f"Reconnection failed: {re}, aborting dim")
-                        raise
-                else:
-                    log(f"Aborting dim after {MAX_CONSECUTIVE_FAILURES} consecutive failures")
-                    raise ConnectionError("Too many consecutive command failures")
+                client = await _reconnect_or_abort(
+                    client, "dim", matter_url, ws_session_ref, listen_task_ref,
+                )
+                consecutive_failures = 0
         else:
             consecutive_failures = 0
 
     # Turn off at the end
-    log("Dim complete, turning off lights")
-    for node_id in node_ids:
-        try:
-            await _send_command(client, node_id, clusters.OnOff.Commands.Off())
-        except Exception as e:
-            log(f"Error turning off node {node_id}: {e}")
+    logger.info("Dim complete, turning off lights")
+    await _send_to_nodes(client, node_ids, clusters.OnOff.Commands.Off(), "turning off")
 
     return client
 
@@ -617,14 +836,13 @@ def _get_matter_url() -> str:
     return os.environ.get("MATTER_SERVER_URL", DEFAULT_MATTER_URL)
 
 
-def load_config() -> tuple[str, list[int]]:
-    """Load configuration from environment variables.
+@functools.lru_cache(maxsize=1)
+def _parse_node_ids(node_ids_str: str) -> tuple[int, ...]:
+    """Parse a comma-separated NODE_IDS value.
 
-    Returns (matter_url, node_ids).
+    Raises ValueError carrying the offending part.  Cached on the raw string,
+    so the service re-parses only if the environment actually changed.
     """
-    matter_url = _get_matter_url()
-    node_ids_str = os.environ.get("NODE_IDS", "")
-
     node_ids = []
     for part in node_ids_str.split(","):
         part = part.strip()
@@ -632,8 +850,22 @@ def load_config() -> tuple[str, list[int]]:
             try:
                 node_ids.append(int(part))
             except ValueError:
-                print(f"Error: Invalid node ID: {part!r}. Must be an integer.", file=sys.stderr)
-                sys.exit(1)
+                raise ValueError(part) from None
+    return tuple(node_ids)
+
+
+def load_config() -> tuple[str, list[int]]:
+    """Load configuration from environment variables.
+
+    Returns (matter_url, node_ids).  Exits with an error if NODE_IDS is
+    missing or invalid.
+    """
+    matter_url = _get_matter_url()
+    try:
+        node_ids = _parse_node_ids(os.environ.get("NODE_IDS", ""))
+    except ValueError as e:
+        print(f"Error: Invalid node ID: {e.args[0]!r}. Must be an integer.", file=sys.stderr)
+        sys.exit(1)
 
     if not node_ids:
         print("Error: NODE_IDS must be set (comma-separated list of Matter node IDs)", file=sys.stderr)
@@ -641,7 +873,7 @@ def load_config() -> tuple[str, list[int]]:
         print("Use 'python main.py list' to see commissioned nodes", file=sys.stderr)
         sys.exit(1)
 
-    return matter_url, node_ids
+    return matter_url, list(node_ids)
 
 
 # ---------------------------------------------------------------------------
@@ -649,281 +881,317 @@ def load_config() -> tuple[str, list[int]]:
 # ---------------------------------------------------------------------------
 
 
-def _seconds_until(target_time_str: str) -> float:
-    """Return seconds from now until the given HH:MM today. Negative if past."""
-    now = datetime.datetime.now()
-    h, m = map(int, target_time_str.split(":"))
-    target = now.replace(hour=h, minute=m, second=0, microsecond=0)
-    return (target - now).total_seconds()
+def _seconds_of_day(now: float) -> float:
+    """Return local seconds since midnight for POSIX timestamp *now*."""
+    return (now + time.localtime(now).tm_gmtoff) % 86400
 
 
-def _seconds_until_midnight() -> float:
-    """Return seconds from now until the next midnight."""
-    now = datetime.datetime.now()
-    midnight = (now + datetime.timedelta(days=1)).replace(
-        hour=0, minute=0, second=0, microsecond=0
-    )
-    return (midnight - now).total_seconds()
+def _seconds_until(h: int, m: int, midnight_epoch: float) -> float:
+    """Return seconds from now until h:m on the day starting at *midnight_epoch*.
 
+    Negative if past.
+    """
+    return midnight_epoch + h * 3600 + m * 60 - time.time()
 
-async def _connect_and_validate(
-    matter_url: str, node_ids: list[int],
-) -> tuple[MatterClient, aiohttp.ClientSession, asyncio.Task]:
-    """Connect to matter-server and validate that configured node IDs exist."""
-    client, ws_session, listen_task = await matter_connect(matter_url)
 
-    nodes = client.get_nodes()
-    available_ids = {node.node_id for node in nodes}
+def _seconds_until_midnight(midnight_epoch: float) -> float:
+    """Return seconds from now until the midnight ending that day."""
+    return midnight_epoch + 86400 - time.time()
+
+
+def _validate_nodes(client: MatterClient, node_ids: list[int]) -> None:
+    """Raise RuntimeError if any configured node ID is unknown to matter-server."""
+    available_ids = {node.node_id for node in client.get_nodes()}
 
     missing = set(node_ids) - available_ids
     if missing:
-        log(f"Warning: Node ID(s) not found on matter-server: {', '.join(str(n) for n in sorted(missing))}")
-        log(f"Available nodes: {', '.join(str(n) for n in sorted(available_ids))}")
-        await matter_disconnect(client, ws_session, listen_task)
+        logger.warning(f"Warning: Node ID(s) not found on matter-server: {', '.join(str(n) for n in sorted(missing))}")
+        logger.warning(f"Available nodes: {', '.join(str(n) for n in sorted(available_ids))}")
         raise RuntimeError(f"Missing node(s): {missing}")
 
+
+async def _connect_and_validate(
+    matter_url: str,
+    node_ids: list[int],
+    ws_session: "aiohttp.ClientSession | None" = None,
+) -> tuple[MatterClient, aiohttp.ClientSession, asyncio.Task]:
+    """Connect to matter-server and validate that configured node IDs exist."""
+    client, ws_session, listen_task = await matter_connect(matter_url, ws_session)
+
+    try:
+        _validate_nodes(client, node_ids)
+    except RuntimeError:
+        await matter_disconnect(client, ws_session, listen_task)
+        raise
+
     return client, ws_session, listen_task
 
 
-def _get_event_target_time(event: str, overrides: dict, today_str: str) -> str | None:
-    """Return the target time for an event today, or None if skipped/disabled."""
+async def _ensure_connected(
+    conn: "tuple[MatterClient, aiohttp.ClientSession, asyncio.Task] | None",
+    matter_url: str,
+    node_ids: list[int],
+) -> tuple[MatterClient, aiohttp.ClientSession, asyncio.Task]:
+    """Return *conn* if it is still live, otherwise open a fresh connection.
+
+    A connection is live while its listen task is running; the task ends as
+    soon as the WebSocket to matter-server drops.  Takes ownership of *conn*:
+    if this raises, everything it was given or opened has been closed.
+    """
+    ws_session = None
+    if conn is not None:
+        client, ws_session, listen_task = conn
+        if not listen_task.done() and not ws_session.closed:
+            try:
+                _validate_nodes(client, node_ids)
+            except RuntimeError:
+                await matter_disconnect(*conn)
+                raise
+            return conn
+        logger.warning("Matter connection lost, reconnecting")
+        await matter_disconnect(client, ws_session, listen_task, close_session=False)
+
+    # Reconnect over the existing aiohttp session (if still open) so the
+    # service keeps a single connector for its whole lifetime
+    try:
+        return await _connect_and_validate(matter_url, node_ids, ws_session)
+    except BaseException:
+        if ws_session is not None:
+            await ws_session.close()
+        raise
+
+
+def _get_event_target_time(
+    event: str, overrides: dict, today_str: str,
+) -> tuple[int, int] | None:
+    """Return the (hour, minute) target for an event today, or None if skipped/disabled."""
     override = get_event_override(overrides, today_str, event)
 
     if override.get("action") == "skip":
         return None
 
     if override.get("action") == "reschedule":
-        return override["time"]
+        return _parse_hhmm(override["time"])
 
     if event == "ramp":
-        return DEFAULT_RAMP_TIME
+        return _DEFAULT_RAMP_HM
     elif event == "dim":
-        return DEFAULT_DIM_TIME
+        return _DEFAULT_DIM_HM
     return None
 
 
 async def _run_event(
-    event: str, test_mode: bool, matter_url: str, node_ids: list[int],
-) -> None:
-    """Connect, execute one event (ramp or dim), and disconnect."""
+    event: str,
+    test_mode: bool,
+    conn: tuple[MatterClient, aiohttp.ClientSession, asyncio.Task],
+    matter_url: str,
+    node_ids: list[int],
+) -> tuple[MatterClient, aiohttp.ClientSession, asyncio.Task]:
+    """Execute one event (ramp or dim) over an open connection.
+
+    Returns the (possibly new) connection, since the ramp or dim may have
+    reconnected part-way through.  Takes ownership of *conn*: on failure or
+    cancellation the current connection is closed before the exception
+    propagates, so callers must not disconnect it again.
+    """
     if event == "ramp":
         total_seconds = 2 * 60 if test_mode else DEFAULT_RAMP_DURATION * 60
+        runner = run_ramp
     else:
         total_seconds = 2 * 60 if test_mode else DEFAULT_DIM_DURATION * 60
+        runner = run_dim
 
-    client = None
-    ws_session = None
-    listen_task = None
+    client, ws_session, listen_task = conn
+    ws_ref = [ws_session]
+    task_ref = [listen_task]
     try:
-        client, ws_session, listen_task = await _connect_and_validate(matter_url, node_ids)
-        ws_ref = [ws_session]
-        task_ref = [listen_task]
-        if event == "ramp":
-            client = await run_ramp(
-                client, node_ids, total_seconds,
-                matter_url=matter_url,
-                ws_session_ref=ws_ref,
-                listen_task_ref=task_ref,
-            )
-        else:
-            client = await run_dim(
-                client, node_ids, total_seconds,
-                matter_url=matter_url,
-                ws_session_ref=ws_ref,
-                listen_task_ref=task_ref,
-            )
-        ws_session = ws_ref[0]
-        listen_task = task_ref[0]
-    finally:
-        if client and ws_session and listen_task:
-            await matter_disconnect(client, ws_session, listen_task)
+        client = await runner(
+            client, node_ids, total_seconds,
+            matter_url=matter_url,
+            ws_session_ref=ws_ref,
+            listen_task_ref=task_ref,
+        )
+    except BaseException:
+        # Close whichever connection is current, which may be a reconnected one
+        await asyncio.shield(matter_disconnect(client, ws_ref[0], task_ref[0]))
+        raise
+
+    return client, ws_ref[0], task_ref[0]
 
 
 async def cmd_service(args) -> None:
     """Run as a persistent service (systemd calls this)."""
     loop = asyncio.get_running_loop()
-    loop.add_signal_handler(signal.SIGUSR1, lambda: (
-        _wake_event.set(),
-        log("Received SIGUSR1, waking up to re-evaluate schedule"),
-    ))
+    loop.add_signal_handler(signal.SIGUSR1, _on_sigusr1)
+
+    # systemctl stop sends SIGTERM; cancel the loop so the finally below can
+    # close the Matter connection instead of the process dying mid-await.
+    loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+
+    _init_service_times()
 
     test_mode = args.test
     if test_mode:
-        log("Service starting in TEST mode (2-minute durations)")
+        logger.info("Service starting in TEST mode (2-minute durations)")
     else:
-        log("Service starting")
+        logger.info("Service starting")
 
-    while True:
-        today_str = datetime.date.today().isoformat()
-        overrides = load_overrides()
+    wake_server = await _start_wake_server()
 
-        # Build list of pending events for today
-        pending = []
+    # Matter connection kept open across events; (re)opened lazily when needed
+    conn = None
+    try:
+        while True:
+            # Work out "today" once per pass; everything below works off these
+            now = time.time()
+            midnight_epoch = now - _seconds_of_day(now)
+            today_str = time.strftime("%Y-%m-%d", time.localtime(now))
+            overrides = load_overrides()
+            state = load_state()
 
-        # Ramp event
-        if not already_ran_today():
-            ramp_override = get_event_override(overrides, today_str, "ramp")
-            if ramp_override.get("action") == "skip":
-                log(f"Skip override active for ramp on {today_str}")
-                record_run()
-            else:
-                target = _get_event_target_time("ramp", overrides, today_str)
-                if target:
-                    pending.append(("ramp", target))
-
-        # Dim event
-        if DEFAULT_DIM_TIME is not None and not already_dimmed_today():
-            dim_override = get_event_override(overrides, today_str, "dim")
-            if dim_override.get("action") == "skip":
-                log(f"Skip override active for dim on {today_str}")
-                record_dim()
-            else:
-                target = _get_event_target_time("dim", overrides, today_str)
-                if target:
-                    pending.append(("dim", target))
+            # Build list of pending events for today
+            pending = []
 
-        if not pending:
-            log(f"All events done for {today_str}, sleeping until midnight")
-            # Clean up expired overrides
-            overrides = load_overrides()
-            cleaned = cleanup_overrides(overrides)
-            if cleaned != overrides:
-                save_overrides(cleaned)
-            secs = _seconds_until_midnight()
-            await interruptible_sleep(secs)
-            continue
-
-        # Sort by target time, pick next
-        pending.sort(key=lambda x: x[1])
-        event, target_time = pending[0]
-        log(f"Next event: {event} at {target_time}")
-
-        # Wait until target time
-        wait_secs = _seconds_until(target_time)
-        if wait_secs > 0:
-            log(f"Sleeping {wait_secs / 60:.0f} minutes until {target_time}")
-            interrupted = await interruptible_sleep(wait_secs)
-            if interrupted:
-                log("Sleep interrupted, re-evaluating schedule")
+            # Ramp event
+            if not _event_done(state, "ramp", today_str):
+                ramp_override = get_event_override(overrides, today_str, "ramp")
+                if ramp_override.get("action") == "skip":
+                    logger.info(f"Skip override active for ramp on {today_str}")
+                    record_run(today_str)
+                else:
+                    target = _get_event_target_time("ramp", overrides, today_str)
+                    if target:
+                        pending.append(("ramp", target))
+
+            # Dim event
+            if DEFAULT_DIM_TIME is not None and not _event_done(state, "dim", today_str):
+                dim_override = get_event_override(overrides, today_str, "dim")
+                if dim_override.get("action") == "skip":
+                    logger.info(f"Skip override active for dim on {today_str}")
+                    record_dim(today_str)
+                else:
+                    target = _get_event_target_time("dim", overrides, today_str)
+                    if target:
+                        pending.append(("dim", target))
+
+            if not pending:
+                logger.info(f"All events done for {today_str}, sleeping until midnight")
+                # Clean up expired overrides
+                cleaned = cleanup_overrides(overrides, today_str)
+                if cleaned != overrides:
+                    save_overrides(cleaned)
+                secs = _seconds_until_midnight(midnight_epoch)
+                await interruptible_sleep(secs)
                 continue
 
-        # Re-check overrides (may have changed while sleeping)
-        overrides = load_overrides()
-        event_override = get_event_override(overrides, today_str, event)
-        if event_override.get("action") == "skip":
-            log(f"Skip override added while sleeping for {event} on {today_str}")
-            if event == "ramp":
-                record_run()
-            else:
-                record_dim()
-            continue
+            # Sort by target time, pick next
+            pending.sort(key=lambda x: x[1])
+            event, (target_h, target_m) = pending[0]
+            target_time = f"{target_h:02d}:{target_m:02d}"
+            logger.info(f"Next event: {event} at {target_time}")
+
+            # Wait until target time
+            wait_secs = _seconds_until(target_h, target_m, midnight_epoch)
+            if wait_secs > 0:
+                logger.info(f"Sleeping {wait_secs / 60:.0f} minutes until {target_time}")
+                interrupted = await interruptible_sleep(wait_secs)
+                if interrupted:
+                    logger.info("Sleep interrupted, re-evaluating schedule")
+                    continue
+
+            # Re-check overrides (may have changed while sleeping)
+            overrides = load_overrides()
+            event_override = get_event_override(overrides, today_str, event)
+            if event_override.get("action") == "skip":
+                logger.info(f"Skip override added while sleeping for {event} on {today_str}")
+                if event == "ramp":
+                    record_run(today_str)
+                else:
+                    record_dim(today_str)
+                continue
 
-        # Check if already done (e.g. manual trigger while sleeping)
-        if event == "ramp" and already_ran_today():
-            continue
-        if event == "dim" and already_dimmed_today():
-            continue
+            # Check if already done (e.g. manual trigger while sleeping)
+            if _event_done(load_state(), event, today_str):
+                continue
 
-        # Execute the event
-        matter_url, node_ids = load_config()
-        try:
-            await _run_event(event, test_mode, matter_url, node_ids)
-            if event == "ramp":
-                record_run()
-            else:
-                record_dim()
-            log(f"{event.capitalize()} complete")
-        except Exception as e:
-            log(f"{event.capitalize()} failed: {e}")
-            await interruptible_sleep(60)
-            continue
+            # Execute the event, reusing the connection from previous events.
+            # Both helpers close the connection themselves if they raise, so
+            # drop our reference until a live one comes back.
+            matter_url, node_ids = load_config()
+            prev_conn, conn = conn, None
+            try:
+                live_conn = await _ensure_connected(prev_conn, matter_url, node_ids)
+                conn = await _run_event(event, test_mode, live_conn, matter_url, node_ids)
+                if event == "ramp":
+                    record_run(today_str)
+                else:
+                    record_dim(today_str)
+                logger.info(f"{event.capitalize()} complete")
+            except Exception as e:
+                logger.error(f"{event.capitalize()} failed: {e}")
+                await interruptible_sleep(60)
+                continue
 
-        # Loop back to check for more events today
+            # Loop back to check for more events today
+    except asyncio.CancelledError:
+        logger.info("Service stopping")
+    finally:
+        if wake_server is not None:
+            wake_server.close()
+        if conn is not None:
+            await asyncio.shield(matter_disconnect(*conn))
 
 
-async def cmd_run(args) -> None:
-    """Run a single ramp immediately (manual trigger)."""
-    total_seconds = 2 * 60 if args.test else DEFAULT_RAMP_DURATION * 60
+async def _run_manual_event(event: str, test_mode: bool) -> None:
+    """Connect, run a single event immediately, and disconnect."""
     matter_url, node_ids = load_config()
-    client = None
-    ws_session = None
-    listen_task = None
     try:
-        client, ws_session, listen_task = await _connect_and_validate(matter_url, node_ids)
-        ws_ref = [ws_session]
-        task_ref = [listen_task]
-        client = await run_ramp(
-            client, node_ids, total_seconds,
-            matter_url=matter_url,
-            ws_session_ref=ws_ref,
-            listen_task_ref=task_ref,
-        )
-        ws_session = ws_ref[0]
-        listen_task = task_ref[0]
+        # Both calls close the connection themselves if they raise
+        conn = await _connect_and_validate(matter_url, node_ids)
+        conn = await _run_event(event, test_mode, conn, matter_url, node_ids)
     except Exception as e:
-        log(f"Error: {e}")
+        logger.error(f"Error: {e}")
         sys.exit(1)
-    finally:
-        if client and ws_session and listen_task:
-            await matter_disconnect(client, ws_session, listen_task)
+    await matter_disconnect(*conn)
+
+
+async def cmd_run(args) -> None:
+    """Run a single ramp immediately (manual trigger)."""
+    await _run_manual_event("ramp", args.test)
 
 
 async def cmd_dim(args) -> None:
     """Run a single dim immediately (manual trigger)."""
-    total_seconds = 2 * 60 if args.test else DEFAULT_DIM_DURATION * 60
-    matter_url, node_ids = load_config()
-    client = None
-    ws_session = None
-    listen_task = None
-    try:
-        client, ws_session, listen_task = await _connect_and_validate(matter_url, node_ids)
-        ws_ref = [ws_session]
-        task_ref = [listen_task]
-        client = await run_dim(
-            client, node_ids, total_seconds,
-            matter_url=matter_url,
-            ws_session_ref=ws_ref,
-            listen_task_ref=task_ref,
-        )
-        ws_session = ws_ref[0]
-        listen_task = task_ref[0]
-    except Exception as e:
-        log(f"Error: {e}")
-        sys.exit(1)
-    finally:
-        if client and ws_session and listen_task:
-            await matter_disconnect(client, ws_session, listen_task)
+    await _run_manual_event("dim", args.test)
 
 
 def cmd_skip(args) -> None:
     """Add a skip override for a date."""
     date_str = parse_date_arg(args.date)
-    event = getattr(args, "event", "ramp")
+    event = args.event
     overrides = load_overrides()
     set_event_override(overrides, date_str, event, {"action": "skip"})
     save_overrides(overrides)
-    log(f"Skipping {event} on {date_str}")
+    logger.info(f"Skipping {event} on {date_str}")
     notify_service()
 
 
 def cmd_reschedule(args) -> None:
     """Change event time for a date."""
     date_str = parse_date_arg(args.date)
-    event = getattr(args, "event", "ramp")
+    event = args.event
     # Validate time format
     try:
-        h, m = map(int, args.time.split(":"))
-        if not (0 <= h <= 23 and 0 <= m <= 59):
-            raise ValueError
-        time_str = f"{h:02d}:{m:02d}"
-    except (ValueError, AttributeError):
-        print(f"Error: Invalid time format: {args.time!r}. Use HH:MM.", file=sys.stderr)
+        h, m = _parse_hhmm(args.time)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    time_str = f"{h:02d}:{m:02d}"
 
     overrides = load_overrides()
     set_event_override(overrides, date_str, event, {"action": "reschedule", "time": time_str})
     save_overrides(overrides)
-    log(f"Rescheduled {event} on {date_str} to {time_str}")
+    logger.info(f"Rescheduled {event} on {date_str} to {time_str}")
     notify_service()
 
 
@@ -936,25 +1204,36 @@ def _next_event_display(
     if default_time is None:
         return f"Next {event}: disabled"
 
-    if done_today:
-        next_date = today + datetime.timedelta(days=1)
+    if done_today or get_event_override(overrides, today_str, event).get("action") == "skip":
+        next_str = (today + datetime.timedelta(days=1)).isoformat()
     else:
-        override = get_event_override(overrides, today_str, event)
-        if override.get("action") == "skip":
-            next_date = today + datetime.timedelta(days=1)
-        else:
-            next_date = today
+        next_str = today_str
 
-    next_str = next_date.isoformat()
     next_override = get_event_override(overrides, next_str, event)
-    if next_override.get("action") == "skip":
+    next_action = next_override.get("action")
+    if next_action == "skip":
         return f"Next {event}: {next_str} — SKIPPED"
-    elif next_override.get("action") == "reschedule":
+    elif next_action == "reschedule":
         return f"Next {event}: {next_str} at {next_override['time']}"
     else:
         return f"Next {event}: {next_str} at {default_time}"
 
 
+def _print_systemd_status() -> None:
+    """Print whether systemd reports the service as active."""
+    try:
+        result = subprocess.run(
+            ["systemctl", "is-active", "--quiet", SERVICE_NAME],
+            capture_output=True, timeout=5,
+        )
+        if result.returncode == 0:
+            print("Service: running")
+        else:
+            print("Service: not running")
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        print("Service: unknown (systemctl not available)")
+
+
 async def cmd_status(args) -> None:
     """Show active overrides and next scheduled events."""
     overrides = load_overrides()
@@ -973,16 +1252,17 @@ async def cmd_status(args) -> None:
     today_str = today.isoformat()
 
     print()
-    print(_next_event_display("ramp", DEFAULT_RAMP_TIME, already_ran_today(), overrides, today))
-    print(_next_event_display("dim", DEFAULT_DIM_TIME, already_dimmed_today(), overrides, today))
+    ramp_done = _event_done(state, "ramp", today_str)
+    dim_done = _event_done(state, "dim", today_str)
+    print(_next_event_display("ramp", DEFAULT_RAMP_TIME, ramp_done, overrides, today))
+    print(_next_event_display("dim", DEFAULT_DIM_TIME, dim_done, overrides, today))
 
     # Show active overrides
-    active = {d: v for d, v in overrides.items() if d >= today_str}
-    if active:
+    active_items = sorted((d, v) for d, v in overrides.items() if d >= today_str)
+    if active_items:
         print()
         print("Active overrides:")
-        for date in sorted(active):
-            entry = active[date]
+        for date, entry in active_items:
             if _is_old_flat_format(entry):
                 # Old flat format
                 if entry.get("action") == "skip":
@@ -991,8 +1271,7 @@ async def cmd_status(args) -> None:
                     print(f"  {date}: ramp reschedule to {entry['time']}")
             else:
                 # Nested format
-                for evt in sorted(entry):
-                    sub = entry[evt]
+                for evt, sub in sorted(entry.items()):
                     if sub.get("action") == "skip":
                         print(f"  {date}: {evt} skip")
                     elif sub.get("action") == "reschedule":
@@ -1001,28 +1280,22 @@ async def cmd_status(args) -> None:
         print()
         print("No active overrides")
 
-    # Service status
+    # Service status: a bare connect to the wake socket held by root or us
+    # proves the service is up without spawning systemctl (and without waking it)
     print()
     try:
-        result = subprocess.run(
-            ["systemctl", "is-active", "--quiet", SERVICE_NAME],
-            capture_output=True, timeout=5,
-        )
-        if result.returncode == 0:
-            print("Service: running")
-        else:
-            print("Service: not running")
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        print("Service: unknown (systemctl not available)")
+        with _connect_wake_socket() as sock:
+            _check_wake_peer(sock)
+        print("Service: running")
+    except OSError:
+        _print_systemd_status()
 
     # Matter server connection check
-    matter_url = _get_matter_url()
     print()
     try:
-        client, ws_session, listen_task = await matter_connect(matter_url)
-        nodes = client.get_nodes()
+        async with matter_session(_get_matter_url()) as client:
+            nodes = client.get_nodes()
         print(f"Matter server: connected ({len(nodes)} node(s))")
-        await matter_disconnect(client, ws_session, listen_task)
     except Exception as e:
         print(f"Matter server: not reachable ({e})")
 
@@ -1030,13 +1303,13 @@ async def cmd_status(args) -> None:
 def cmd_clear(args) -> None:
     """Remove override(s)."""
     overrides = load_overrides()
-    event = getattr(args, "event", None)
+    event = args.event
 
     if args.date:
         date_str = parse_date_arg(args.date)
         entry = overrides.get(date_str)
         if entry is None:
-            log(f"No override found for {date_str}")
+            logger.info(f"No override found for {date_str}")
         elif event:
             # Clear specific event within a date
             if _is_old_flat_format(entry):
@@ -1047,134 +1320,106 @@ def cmd_clear(args) -> None:
                 if not entry:
                     del overrides[date_str]
                 save_overrides(overrides)
-                log(f"Cleared {event} override for {date_str}")
+                logger.info(f"Cleared {event} override for {date_str}")
             else:
-                log(f"No {event} override found for {date_str}")
+                logger.info(f"No {event} override found for {date_str}")
         else:
             del overrides[date_str]
             save_overrides(overrides)
-            log(f"Cleared all overrides for {date_str}")
+            logger.info(f"Cleared all overrides for {date_str}")
     else:
         save_overrides({})
-        log("Cleared all overrides")
+        logger.info("Cleared all overrides")
 
     notify_service()
 
 
 async def cmd_list(args) -> None:
     """List all commissioned Matter nodes."""
-    matter_url = _get_matter_url()
-    client = None
-    ws_session = None
-    listen_task = None
     try:
-        client, ws_session, listen_task = await matter_connect(matter_url)
-        nodes = client.get_nodes()
+        async with matter_session(_get_matter_url()) as client:
+            nodes = client.get_nodes()
 
-        if not nodes:
-            print("No commissioned nodes found.")
-        else:
-            print(f"Commissioned nodes ({len(nodes)}):")
-            print()
-            for node in nodes:
-                node_id = node.node_id
-                # Try to get device name from Basic Information cluster
-                name = "Unknown"
-                try:
-                    basic_info = node.get_attribute_value(
-                        clusters.BasicInformation.Attributes.NodeLabel
-                    )
-                    if basic_info:
-                        name = basic_info
-                except Exception:
-                    pass
+            if not nodes:
+                print("No commissioned nodes found.")
+            else:
+                print(f"Commissioned nodes ({len(nodes)}):")
+                print()
+                for node in nodes:
+                    node_id = node.node_id
+                    # Try to get device name from Basic Information cluster
+                    name = "Unknown"
+                    try:
+                        basic_info = node.get_attribute_value(
+                            clusters.BasicInformation.Attributes.NodeLabel
+                        )
+                        if basic_info:
+                            name = basic_info
+                    except Exception:
+                        pass
 
-                # Try to get on/off state
-                on_off = "unknown"
-                try:
-                    on_off_val = node.get_attribute_value(
-                        clusters.OnOff.Attributes.OnOff
-                    )
-                    on_off = "ON" if on_off_val else "OFF"
-                except Exception:
-                    pass
+                    # Try to get on/off state
+                    on_off = "unknown"
+                    try:
+                        on_off_val = node.get_attribute_value(
+                            clusters.OnOff.Attributes.OnOff
+                        )
+                        on_off = "ON" if on_off_val else "OFF"
+                    except Exception:
+                        pass
 
-                # Try to get brightness level
-                brightness = "N/A"
-                try:
-                    level = node.get_attribute_value(
-                        clusters.LevelControl.Attributes.CurrentLevel
-                    )
-                    if level is not None:
-                        brightness = f"{matter_level_to_pct(level)}%"
-                except Exception:
-                    pass
+                    # Try to get brightness level
+                    brightness = "N/A"
+                    try:
+                        level = node.get_attribute_value(
+                            clusters.LevelControl.Attributes.CurrentLevel
+                        )
+                        if level is not None:
+                            brightness = f"{matter_level_to_pct(level)}%"
+                    except Exception:
+                        pass
 
-                print(f"  Node {node_id}: {name}")
-                print(f"    Power: {on_off}")
-                print(f"    Brightness: {brightness}")
-                print()
+                    print(f"  Node {node_id}: {name}")
+                    print(f"    Power: {on_off}")
+                    print(f"    Brightness: {brightness}")
+                    print()
     except Exception as e:
-        log(f"Error: {e}")
+        logger.error(f"Error: {e}")
         sys.exit(1)
-    finally:
-        if client and ws_session and listen_task:
-            await matter_disconnect(client, ws_session, listen_task)
 
 
 async def cmd_commission(args) -> None:
     """Commission a new Matter device."""
-    matter_url = _get_matter_url()
-    client = None
-    ws_session = None
-    listen_task = None
     try:
-        client, ws_session, listen_task = await matter_connect(matter_url)
-        log(f"Commissioning device with code: {args.code}")
-        result = await client.commission_with_code(args.code)
-        log(f"Commissioned successfully! Node ID: {result}")
+        async with matter_session(_get_matter_url()) as client:
+            logger.info(f"Commissioning device with code: {args.code}")
+            result = await client.commission_with_code(args.code)
+            logger.info(f"Commissioned successfully! Node ID: {result}")
     except Exception as e:
-        log(f"Commission failed: {e}")
+        logger.error(f"Commission failed: {e}")
         sys.exit(1)
-    finally:
-        if client and ws_session and listen_task:
-            await matter_disconnect(client, ws_session, listen_task)
 
 
 async def cmd_set_wifi(args) -> None:
     """Store WiFi credentials on the matter-server for commissioning."""
-    matter_url = _get_matter_url()
-    client = None
-    ws_session = None
-    listen_task = None
     try:
-        client, ws_session, listen_task = await matter_connect(matter_url)
-        await client.set_wifi_credentials(ssid=args.ssid, credentials=args.password)
-        log(f"WiFi credentials set for SSID: {args.ssid}")
+        async with matter_session(_get_matter_url()) as client:
+            await client.set_wifi_credentials(ssid=args.ssid, credentials=args.password)
+            logger.info(f"WiFi credentials set for SSID: {args.ssid}")
     except Exception as e:
-        log(f"Failed to set WiFi credentials: {e}")
+        logger.error(f"Failed to set WiFi credentials: {e}")
         sys.exit(1)
-    finally:
-        if client and ws_session and listen_task:
-            await matter_disconnect(client, ws_session, listen_task)
 
 
 async def cmd_remove_node(args) -> None:
     """Remove a commissioned node from the matter-server."""
-    matter_url = _get_matter_url()
-    client = None
-    ws_session = None
-    listen_task = None
     try:
-        client, ws_session, listen_task = await matter_connect(matter_url)
-        await client.remove_node(args.node_id)
-        log(f"Removed node {args.node_id}")
+        async with matter_session(_get_matter_url()) as client:
+            await client.remove_node(args.node_id)
+            logger.info(f"Removed node {args.node_id}")
     except Exception as e:
-        log(f"Failed to remove node: {e}")
+        logger.error(f"Failed to remove node: {e}")
         sys.exit(1)
-    finally:
-        if client and ws_session and listen_task:
-            await matter_disconnect(client, ws_session, listen_task)
 
 
 # ---------------------------------------------------------------------------
@@ -1280,6 +1525,7 @@ def main() -> None:
     # Load .env and set env-dependent globals for all commands
     load_dotenv()
     _init_env_config()
+    _init_logging()
 
     # Sync commands (no Matter connection needed)
     sync_dispatch = {
@@ -0,0 +1,71 @@
+"""Check the timestamp-based schedule waits against the old datetime maths."""
+
+import datetime
+import os
+import time
+
+import pytest
+
+import main
+
+UTC = datetime.timezone.utc
+
+# (TZ, UTC instant) pairs, including DST-transition days and a 30-min DST shift
+CASES = [
+    ("UTC", datetime.datetime(2026, 6, 15, 9, 30, tzinfo=UTC)),
+    ("Asia/Kolkata", datetime.datetime(2026, 1, 10, 20, 45, tzinfo=UTC)),
+    # New York spring forward (02:00 EST -> 03:00 EDT), before and after
+    ("America/New_York", datetime.datetime(2026, 3, 8, 6, 30, tzinfo=UTC)),
+    ("America/New_York", datetime.datetime(2026, 3, 8, 14, 0, tzinfo=UTC)),
+    # New York fall back (02:00 EDT -> 01:00 EST), before and after
+    ("America/New_York", datetime.datetime(2026, 11, 1, 5, 30, tzinfo=UTC)),
+    ("America/New_York", datetime.datetime(2026, 11, 1, 15, 0, tzinfo=UTC)),
+    # Lord Howe fall back (02:00 +11 -> 01:30 +10:30)
+    ("Australia/Lord_Howe", datetime.datetime(2026, 4, 5, 2, 0, tzinfo=UTC)),
+]
+
+TARGETS = [(0, 0), (1, 45), (7, 20), (12, 0), (23, 59)]
+
+
+@pytest.fixture
+def pin_tz(monkeypatch):
+    """Set TZ for the test and restore the process time zone afterwards."""
+    def pin(tz: str) -> None:
+        monkeypatch.setenv("TZ", tz)
+        time.tzset()
+
+    yield pin
+    monkeypatch.undo()
+    time.tzset()
+
+
+def _old_seconds_until(h: int, m: int, now: datetime.datetime) -> float:
+    target = now.replace(hour=h, minute=m, second=0, microsecond=0)
+    return (target - now).total_seconds()
+
+
+def _old_seconds_until_midnight(now: datetime.datetime) -> float:
+    midnight = (now + datetime.timedelta(days=1)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    return (midnight - now).total_seconds()
+
+
+@pytest.mark.parametrize("tz, instant", CASES)
+def test_matches_datetime_implementation(tz, instant, pin_tz, monkeypatch):
+    if not os.path.exists(f"/usr/share/zoneinfo/{tz}"):
+        pytest.skip(f"no tzdata for {tz}")
+    pin_tz(tz)
+
+    now = instant.timestamp()
+    monkeypatch.setattr(main.time, "time", lambda: now)
+    now_local = datetime.datetime.fromtimestamp(now)
+    midnight_epoch = now - main._seconds_of_day(now)
+
+    for h, m in TARGETS:
+        assert main._seconds_until(h, m, midnight_epoch) == pytest.approx(
+            _old_seconds_until(h, m, now_local)
+        ), f"{h:02d}:{m:02d}"
+    assert main._seconds_until_midnight(midnight_epoch) == pytest.approx(
+        _old_seconds_until_midnight(now_local)
+    )